@@ -1,15 +1,20 @@
 import streamlit as st
 import os
+import time
 from dotenv import load_dotenv
 from pathlib import Path
 
-from langchain_core.documents import Document
-from langchain_text_splitters import CharacterTextSplitter
 from langchain_community.embeddings import HuggingFaceEmbeddings
 from langchain_community.vectorstores import Pinecone as LangchainPinecone
 
 from pinecone import Pinecone
-import ollama
+
+from src.config import Config
+from src.fastpath import FastPath
+from src.memory import ConversationMemory
+from src.metadata import SCOPES, load_chunks, to_pinecone_filter
+from src.router import AUTO_MODEL, ModelRouter
+from src.scheduler import INTERACTIVE, get_scheduler
 
 
 # ==================================================
@@ -21,7 +26,7 @@ load_dotenv()
 # ==================================================
 # INTERNAL CONFIG (HIDDEN FROM UI)
 # ==================================================
-DATA_PATH = "data/playmetrics_full_dataset.txt"   # <-- change only here if needed
+DATA_DIR = Config.DATA_DIR   # <-- change only here if needed
 DEFAULT_NAMESPACE = "mmtt-docs"
 
 
@@ -156,6 +161,30 @@ pc = get_pinecone()
 indexes = [i["name"] for i in pc.list_indexes()]
 
 
+# ==================================================
+# FAST PATH (SHARED ACROSS SESSIONS FOR STATS)
+# ==================================================
+@st.cache_resource
+def get_fast_path():
+    return FastPath()
+
+fast_path = get_fast_path()
+
+
+@st.cache_resource
+def get_router():
+    return ModelRouter()
+
+router = get_router()
+
+# One scheduler per process so all sessions share the Ollama limits
+scheduler = get_scheduler()
+
+# Bounded multi-turn context: recent turns verbatim + running summary
+if "memory" not in st.session_state:
+    st.session_state.memory = ConversationMemory(scheduler=scheduler)
+
+
 # ==================================================
 # SIDEBAR (CLEAN – NO DATA PATH)
 # ==================================================
@@ -173,13 +202,44 @@ with st.sidebar:
 
     model_name = st.selectbox(
         "🤖 Model",
-        ["gemma2:2b", "llama2", "mistral"]
+        [AUTO_MODEL] + Config.LLM_MODELS,
+        format_func=lambda m: "Auto (route by question)" if m == AUTO_MODEL else m
+    )
+
+    scope = st.selectbox("🔎 Search Scope", list(SCOPES))
+
+    use_fast_path = st.checkbox(
+        "⚡ Extractive fast path",
+        value=Config.FAST_PATH_ENABLED
     )
 
     st.markdown("---")
 
+    stats = fast_path.stats()
+    st.caption(
+        f"⚡ Fast path: {stats['hits']}/{stats['requests']} "
+        f"({stats['hit_rate']:.0%}) · ~{stats['latency_saved_seconds']:.1f}s saved"
+    )
+
+    llm_stats = scheduler.metrics()
+    st.caption(
+        f"🧵 LLM queue: {llm_stats['queue_depth']} waiting · "
+        f"{llm_stats['running']} running · "
+        f"avg wait {llm_stats['avg_wait_seconds']:.1f}s"
+    )
+
+    route_stats = router.stats()
+    st.caption(
+        f"🧭 Routing: {route_stats['routed']} routed · "
+        f"{route_stats['escalation_rate']:.0%} escalated"
+    )
+    for m, s in route_stats["models"].items():
+        if s["calls"]:
+            st.caption(f"• {m}: {s['calls']} calls · avg {s['avg_seconds']:.1f}s")
+
     if st.button("🔄 Reset Chat", use_container_width=True):
         st.session_state.messages = []
+        st.session_state.memory.clear()
         st.rerun()
 
 
@@ -197,21 +257,14 @@ def load_embeddings():
 # SAFE FILE LOADER (NO LANGCHAIN LOADERS)
 # ==================================================
 def load_documents():
-    path = Path(DATA_PATH)
+    path = Path(DATA_DIR)
 
     if not path.exists():
-        st.error(f"Data file not found: {DATA_PATH}")
+        st.error(f"Data folder not found: {DATA_DIR}")
         return []
 
-    text = path.read_text(encoding="utf-8", errors="ignore")
-    docs = [Document(page_content=text)]
-
-    splitter = CharacterTextSplitter(
-        chunk_size=500,
-        chunk_overlap=100
-    )
-
-    return splitter.split_documents(docs)
+    # Chunks carry doc_type / site / source / section metadata for scoping
+    return load_chunks(DATA_DIR)
 
 
 # ==================================================
@@ -227,12 +280,12 @@ def setup_vectorstore(docs, embeddings):
 
 
 # ==================================================
-# OLLAMA
+# OLLAMA (VIA SHARED SCHEDULER)
 # ==================================================
-def ask_llm(context, question):
-    res = ollama.chat(
-        model=model_name,
-        messages=[
+def ask_llm(context, question, model, history=""):
+    ticket = scheduler.submit(
+        model,
+        [
             {
                 "role": "system",
                 "content": (
@@ -243,11 +296,34 @@ def ask_llm(context, question):
             },
             {
                 "role": "user",
-                "content": f"Context:\n{context}\n\nQuestion:\n{question}"
+                "content": (
+                    f"Conversation so far:\n{history or '(none)'}\n\n"
+                    f"Context:\n{context}\n\nQuestion:\n{question}"
+                )
             }
-        ]
+        ],
+        priority=INTERACTIVE
     )
-    return res["message"]["content"]
+
+    # Poll instead of blocking so Streamlit can stop this run when the user
+    # leaves or reruns; the finally block then releases our queue slot.
+    status = st.empty()
+    start = time.perf_counter()
+    try:
+        while not ticket.done():
+            if time.perf_counter() - start > scheduler.timeout:
+                ticket.cancel("timeout")
+                return "The model is busy right now, please try again."
+            status.caption(
+                f"⏳ Waiting for {model} "
+                f"({scheduler.queue_depth(model)} queued)"
+            )
+            time.sleep(0.25)
+        return ticket.result()
+    finally:
+        status.empty()
+        if not ticket.done():
+            ticket.cancel()
 
 
 # ==================================================
@@ -269,7 +345,7 @@ if not st.session_state.initialized:
                 docs = load_documents()
 
                 vectorstore = setup_vectorstore(docs, embeddings)
-                st.session_state.retriever = vectorstore.as_retriever(k=3)
+                st.session_state.vectorstore = vectorstore
 
                 st.session_state.initialized = True
                 st.success("System ready!")
@@ -284,7 +360,16 @@ if st.session_state.initialized:
         st.markdown(
             f"<div class='chat {msg['role']}'>"
             f"<strong>{'You' if msg['role']=='user' else 'AI'}:</strong><br>"
-            f"{msg['content']}</div>",
+            f"{msg['content']}"
+            + (
+                f"<br><small>⚡ Extracted from {msg['source']}</small>"
+                if msg.get("fast_path") else ""
+            )
+            + (
+                f"<br><small>🤖 {msg['model']}</small>"
+                if msg.get("model") else ""
+            )
+            + "</div>",
             unsafe_allow_html=True
         )
 
@@ -293,13 +378,48 @@ if st.session_state.initialized:
             {"role": "user", "content": prompt}
         )
 
-        docs = st.session_state.retriever.invoke(prompt)
-        context = "\n\n".join(d.page_content for d in docs)
+        memory = st.session_state.memory
+        search_query = memory.rewrite(prompt)
 
-        answer = ask_llm(context, prompt)
-
-        st.session_state.messages.append(
-            {"role": "assistant", "content": answer}
+        scored_docs = st.session_state.vectorstore.similarity_search_with_score(
+            search_query,
+            k=Config.TOP_K,
+            filter=to_pinecone_filter(SCOPES[scope])
         )
 
+        fast = fast_path.try_answer(search_query, scored_docs) if use_fast_path else None
+
+        if fast:
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": fast["response"],
+                "fast_path": True,
+                "source": fast["sources"][0]["url"]
+            })
+        else:
+            context = "\n\n".join(d.page_content for d, _ in scored_docs)
+            history = memory.history()
+
+            start = time.perf_counter()
+            if model_name == AUTO_MODEL:
+                routed = router.run(
+                    search_query,
+                    scored_docs,
+                    lambda m: ask_llm(context, prompt, m, history)
+                )
+                answer, used_model = routed["response"], routed["model"]
+            else:
+                answer, used_model = ask_llm(context, prompt, model_name, history), model_name
+            fast_path.record_llm(time.perf_counter() - start)
+
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": answer,
+                "fast_path": False,
+                "model": used_model
+            })
+
+        memory.add_turn("user", prompt)
+        memory.add_turn("assistant", st.session_state.messages[-1]["content"])
+
         st.rerun()
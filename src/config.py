@@ -11,6 +11,29 @@ class Config:
 
     # Ollama
     OLLAMA_MODEL = "gemma2:2b"
+    LLM_MODELS = ["gemma2:2b", "llama2", "mistral"]   # cheapest first
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "1"))   # per model
+    LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "120"))              # seconds
+
+    # Data
+    DATA_DIR = "data"
+    CHUNK_SIZE = 500
+    CHUNK_OVERLAP = 100
 
     # Retrieval
     TOP_K = 3
+
+    # Extractive fast path (answer from the top chunk, skip the LLM)
+    FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"
+    FAST_PATH_MIN_SIMILARITY = float(os.getenv("FAST_PATH_MIN_SIMILARITY", "0.6"))
+    FAST_PATH_MIN_SPAN_SCORE = float(os.getenv("FAST_PATH_MIN_SPAN_SCORE", "0.75"))
+
+    # Model routing (model="auto")
+    ROUTER_MAX_ESCALATIONS = int(os.getenv("ROUTER_MAX_ESCALATIONS", "1"))
+    ROUTER_MIN_TOP_SCORE = 0.45     # weaker top match -> harder question
+    ROUTER_MIN_SPREAD = 0.03        # flat scores -> ambiguous retrieval
+
+    # Conversation memory
+    MEMORY_MODEL = "gemma2:2b"      # summaries + follow-up rewrites
+    MEMORY_TURN_TOKENS = int(os.getenv("MEMORY_TURN_TOKENS", "600"))
+    MEMORY_SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", "200"))
@@ -0,0 +1,264 @@
+import logging
+import re
+import threading
+
+from src.config import Config
+from src.questions import is_lookup
+
+logger = logging.getLogger(__name__)
+
+_STOPWORDS = {
+    "a", "an", "the", "is", "are", "was", "were", "be", "of", "in", "on", "at",
+    "to", "for", "and", "or", "what", "who", "whom", "which", "where", "when",
+    "how", "why", "does", "do", "did", "it", "its", "this", "that", "me", "tell",
+    "about", "please", "can", "you", "give", "show",
+}
+_TOKEN = re.compile(r"[a-z0-9]+")
+_SENTENCE_SPLIT = re.compile(r"(?<=[.!?])\s+")
+_SEPARATOR = re.compile(r"\s*[-=]{3,}\s*")
+# "GitHub: https://...", "Role: Team Mentor": one fact per line, never joined
+_KEY_VALUE = re.compile(r"^\s*[A-Za-z][\w /&()-]{0,30}:\s*\S")
+_BULLET = re.compile(r"^\s*([-*\u2022]|\d+[.)])\s+")
+# Shorter spans are usually headings or labels rather than answers
+_MIN_SPAN_WORDS = 6
+
+_PERSON = re.compile(r"\b(Name|Role):|\b[A-Z][a-z]+ [A-Z][a-z]+\b")
+_DEFINITION_QUERY = re.compile(r"^\s*(what is|what's)\s+(.+?)\s*\??\s*$", re.IGNORECASE)
+_PLACE = re.compile(r"\b(at|in)\s+\W*[A-Z]")
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+
+
+def _stem(term: str) -> str:
+    # Crude suffix stripping so "used" matches "use" and "links" matches "link"
+    return re.sub(r"(ing|ed|es|e|s)$", "", term) if len(term) > 2 else term
+
+
+def _terms(text: str) -> set:
+    return {
+        _stem(t) for t in _TOKEN.findall(text.lower())
+        if t not in _STOPWORDS and len(t) > 1
+    }
+
+
+_URL_WORDS = {_stem(w) for w in (
+    "url", "link", "links", "website", "site", "github", "linkedin", "instagram"
+)}
+_WEBSITE_WORDS = {_stem(w) for w in ("website", "site")}
+_PLATFORMS = {"github": "github.com", "linkedin": "linkedin.com", "instagram": "instagram.com"}
+_SOCIAL_DOMAINS = (*_PLATFORMS.values(), "x.com", "twitter.com")
+
+
+def _strip_headings(text: str) -> str:
+    # Drop underlined headings ("2. Where MMTT Is Used\n-----") so they
+    # never get glued onto an answer span
+    lines = text.splitlines()
+    kept = []
+    for i, line in enumerate(lines):
+        next_line = lines[i + 1] if i + 1 < len(lines) else ""
+        if _SEPARATOR.fullmatch(next_line):
+            continue
+        kept.append(line)
+    return "\n".join(kept)
+
+
+def _blocks(text: str) -> list:
+    """Sections of the chunk between separator lines (one team member,
+    one numbered section)."""
+    blocks, current = [], []
+    for line in _strip_headings(text).splitlines():
+        if _SEPARATOR.fullmatch(line):
+            blocks.append(current)
+            current = []
+        else:
+            current.append(line)
+    blocks.append(current)
+    return ["\n".join(b) for b in blocks if any(line.strip() for line in b)]
+
+
+def _units(paragraph: list) -> list:
+    """Lines of one paragraph regrouped into answer units: wrapped prose is
+    joined back together, "Key: value" lines stay on their own, and a line
+    ending in ":" keeps the bullet list that follows it."""
+    units = []
+    for line in paragraph:
+        line = line.strip()
+        if _BULLET.match(line) and units and units[-1][1] in ("intro", "list"):
+            units[-1] = (f"{units[-1][0]}\n{line}", "list")
+        elif _BULLET.match(line) or _KEY_VALUE.match(line):
+            units.append((line, "line"))
+        elif line.endswith(":"):
+            units.append((line, "intro"))
+        elif units and units[-1][1] == "prose":
+            units[-1] = (f"{units[-1][0]} {line}", "prose")
+        else:
+            units.append((line, "prose"))
+    return units
+
+
+def _spans(text: str, keep_links: bool = False) -> list:
+    """(span, penalty, block) candidates. Links are kept whatever their
+    length when the query asks for one."""
+    spans = []
+    for block in _blocks(text):
+        # Keep "including:" together with a list that follows a blank line
+        block = re.sub(r":[ \t]*\n\s*\n(?=[ \t]*([-*\u2022]|\d+[.)])\s)", ":\n", block)
+        for paragraph in re.split(r"\n\s*\n", block):
+            sentences = []
+            for unit, kind in _units([l for l in paragraph.splitlines() if l.strip()]):
+                if kind == "prose":
+                    sentences += [s.strip() for s in _SENTENCE_SPLIT.split(unit) if s.strip()]
+                else:
+                    sentences.append(unit)
+
+            # Single sentences, plus adjacent pairs within the paragraph for
+            # "Name: ...\nRole: ..." style answers
+            spans += [(s, 0.0, block) for s in sentences]
+            spans += [(f"{a} {b}", 0.05, block) for a, b in zip(sentences, sentences[1:])]
+
+    return [
+        (s, p, b) for s, p, b in spans
+        if len(_TOKEN.findall(s.lower())) >= _MIN_SPAN_WORDS or (keep_links and "http" in s)
+    ]
+
+
+def _asks_link(query: str) -> bool:
+    return bool(_terms(query) & _URL_WORDS)
+
+
+def _link_matches(query_terms: set, span: str) -> bool:
+    url = span.lower()
+    asked = [domain for name, domain in _PLATFORMS.items() if name in query_terms]
+    if asked:
+        return any(domain in url for domain in asked)
+    if query_terms & _WEBSITE_WORDS:
+        return not any(domain in url for domain in _SOCIAL_DOMAINS)
+    return True
+
+
+def answer_type_match(query: str, span: str) -> bool:
+    """True when the span holds the kind of answer the lookup asks for:
+    a link, a person/role, a place or list, a date, or a definition of
+    the asked-about term."""
+    if _asks_link(query):
+        return "http" in span and _link_matches(_terms(query), span)
+    if re.match(r"^\s*who\b", query, re.IGNORECASE):
+        return bool(_PERSON.search(span))
+    if re.match(r"^\s*where\b", query, re.IGNORECASE):
+        # "including:\n- Defense ...\n- Surveillance ..." or "at IIT Roorkee"
+        is_list = any(_BULLET.match(line) for line in span.splitlines()[1:])
+        return is_list or bool(_PLACE.search(span))
+    if re.match(r"^\s*when\b", query, re.IGNORECASE):
+        return bool(_YEAR.search(span))
+
+    match = _DEFINITION_QUERY.match(query)
+    if match:
+        subject = re.escape(match.group(2))
+        return bool(re.search(rf"\b{subject}\b[^.]*?\b(is|are)\b", span, re.IGNORECASE))
+    return False
+
+
+def score_span(query: str, span: str, context: str = "") -> float:
+    """Share of the query's content words found in the span. For link
+    lookups the URL line rarely names its owner, so the entity asked about
+    is looked up in the surrounding section (context) instead."""
+    query_terms = _terms(query)
+    if not query_terms:
+        return 0.0
+
+    if query_terms & _URL_WORDS and "http" in span:
+        entity = query_terms - _URL_WORDS
+        if not entity:
+            return 1.0
+        return len(entity & _terms(context or span)) / len(entity)
+
+    return len(query_terms & _terms(span)) / len(query_terms)
+
+
+class FastPath:
+    """Answers lookups straight from the top retrieved chunk when both the
+    retrieval similarity and the extractive span score clear their
+    thresholds, so the LLM call can be skipped."""
+
+    def __init__(
+        self,
+        enabled: bool = Config.FAST_PATH_ENABLED,
+        min_similarity: float = Config.FAST_PATH_MIN_SIMILARITY,
+        min_span_score: float = Config.FAST_PATH_MIN_SPAN_SCORE,
+    ):
+        self.enabled = enabled
+        self.min_similarity = min_similarity
+        self.min_span_score = min_span_score
+
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.hits = 0
+        self.llm_calls = 0
+        self.llm_seconds = 0.0
+
+    def try_answer(self, query: str, scored_docs: list):
+        """scored_docs: [(Document, similarity)] best first. Returns a
+        response dict, or None when the LLM should be used."""
+        with self._lock:
+            self.requests += 1
+
+        if not self.enabled or not scored_docs:
+            return None
+
+        # Explain/why/how questions always go to the LLM
+        if not is_lookup(query):
+            return None
+
+        doc, similarity = scored_docs[0]
+        if similarity < self.min_similarity:
+            return None
+
+        # Word overlap alone cannot tell an answer from a sentence that merely
+        # repeats the question, so every span must match the answer type too
+        best, best_score = None, 0.0
+        for span, penalty, block in _spans(doc.page_content, keep_links=_asks_link(query)):
+            if not answer_type_match(query, span):
+                continue
+            score = score_span(query, span, block) - penalty
+            if score > best_score:
+                best, best_score = span, score
+
+        if best is None or best_score < self.min_span_score:
+            return None
+
+        with self._lock:
+            self.hits += 1
+
+        meta = doc.metadata or {}
+        logger.info(
+            "Fast path answer (similarity=%.3f, span=%.3f, source=%s): %r",
+            similarity, best_score, meta.get("source"), query
+        )
+
+        return {
+            "response": best,
+            "sources": [{
+                "title": meta.get("title") or meta.get("section") or "Source",
+                "url": meta.get("source"),
+                "doc_type": meta.get("doc_type")
+            }],
+            "fast_path": True,
+            "similarity": similarity,
+            "span_score": best_score
+        }
+
+    def record_llm(self, seconds: float):
+        with self._lock:
+            self.llm_calls += 1
+            self.llm_seconds += seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            avg_llm = self.llm_seconds / self.llm_calls if self.llm_calls else 0.0
+            return {
+                "requests": self.requests,
+                "hits": self.hits,
+                "hit_rate": self.hits / self.requests if self.requests else 0.0,
+                "avg_llm_seconds": avg_llm,
+                # Estimated from the average observed LLM generation time
+                "latency_saved_seconds": self.hits * avg_llm
+            }
@@ -0,0 +1,339 @@
+"""Concurrent-user load generator for the chat service.
+
+Drives RAGEngine in-process against local Pinecone/Ollama stand-ins (or a
+real HTTP endpoint) with a ramp of simulated users and reports throughput,
+latency percentiles, error rate and the saturation point.
+
+    python -m src.loadtest --users 1,2,4,8,16 --duration 20
+    python -m src.loadtest serve --port 8000          # stand-in HTTP target
+    python -m src.loadtest --url http://localhost:8000/chat
+"""
+import argparse
+import hashlib
+import json
+import logging
+import random
+import re
+import threading
+import time
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src.config import Config
+from src.local_index import LocalVectorStore
+from src.metadata import load_chunks
+from src.scheduler import LLMScheduler
+
+logger = logging.getLogger(__name__)
+
+# Example questions from rag.ipynb
+NOTEBOOK_QUESTIONS = [
+    "What is MMTT?",
+    "who is MMTT ?",
+    "motive of project ?",
+    "what problem did it solve ?",
+]
+_NUMBERED_HEADING = re.compile(r"^\d+(?:\.\d+)*\.?\s+(.+)$")
+
+
+# -----------------------------
+# Stand-ins
+# -----------------------------
+class HashingEmbeddings:
+    """Deterministic bag-of-words embeddings: no model download needed."""
+
+    def __init__(self, dim: int = 256):
+        self.dim = dim
+
+    def _embed(self, text: str) -> list:
+        vec = [0.0] * self.dim
+        for word in re.findall(r"[a-z0-9]+", text.lower()):
+            vec[int(hashlib.md5(word.encode()).hexdigest(), 16) % self.dim] += 1.0
+        return vec
+
+    def embed_documents(self, texts: list) -> list:
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> list:
+        return self._embed(text)
+
+
+class SlowVectorStore:
+    """Local index with added latency to stand in for a Pinecone round trip."""
+
+    def __init__(self, store, latency: float, jitter: float = 0.2):
+        self.store = store
+        self.latency = latency
+        self.jitter = jitter
+
+    def _sleep(self):
+        if self.latency:
+            time.sleep(self.latency * random.uniform(1 - self.jitter, 1 + self.jitter))
+
+    def similarity_search_with_score(self, query, k=4, filter=None):
+        self._sleep()
+        return self.store.similarity_search_with_score(query, k, filter)
+
+    def similarity_search(self, query, k=4, filter=None):
+        self._sleep()
+        return self.store.similarity_search(query, k, filter)
+
+
+class FakeOllama:
+    """Ollama stand-in: base latency that stretches with concurrent
+    generations, like a single local instance sharing CPU."""
+
+    def __init__(self, latency: float, contention: float = 0.5, jitter: float = 0.2):
+        self.latency = latency
+        self.contention = contention
+        self.jitter = jitter
+        self._lock = threading.Lock()
+        self._active = 0
+
+    def __call__(self, model: str, messages: list, options: dict = None) -> str:
+        with self._lock:
+            self._active += 1
+            active = self._active
+        try:
+            delay = self.latency * (1 + self.contention * (active - 1))
+            time.sleep(delay * random.uniform(1 - self.jitter, 1 + self.jitter))
+            question = messages[-1]["content"].rsplit("Question:", 1)[-1].strip()
+            return f"[{model}] stand-in answer to: {question[:80]}"
+        finally:
+            with self._lock:
+                self._active -= 1
+
+
+def build_standin_engine(args):
+    from src.rag import RAGEngine
+
+    store = LocalVectorStore.from_documents(load_chunks(), HashingEmbeddings())
+    scheduler = LLMScheduler(
+        max_concurrency=args.llm_concurrency,
+        generate=FakeOllama(args.llm_latency, args.llm_contention)
+    )
+    return RAGEngine(
+        vectorstore=SlowVectorStore(store, args.retrieval_latency),
+        scheduler=scheduler
+    )
+
+
+# -----------------------------
+# Question Mix
+# -----------------------------
+def question_mix(notebook_weight: int = 3) -> list:
+    """Notebook examples (weighted) plus one question per real dataset
+    heading: numbered sections ("3. Why MMTT Was Built") and team role
+    banners ("HARDWARE LEAD"). Scraped UI labels are skipped."""
+    questions = set()
+    for d in load_chunks():
+        section = d.metadata.get("section", "")
+        numbered = _NUMBERED_HEADING.match(section)
+        if numbered:
+            questions.add(f"Tell me about {numbered.group(1).lower()}")
+        elif d.metadata.get("doc_type") == "team" and not section.startswith("TEAM INFORMATION"):
+            role = re.sub(r"^team\s+", "", section.lower())
+            questions.add(f"Who is the team's {role}?")
+    return NOTEBOOK_QUESTIONS * notebook_weight + sorted(questions)
+
+
+# -----------------------------
+# Targets
+# -----------------------------
+class InProcessTarget:
+    def __init__(self, engine, model: str, multi_turn: bool):
+        self.engine = engine
+        self.model = model
+        self.multi_turn = multi_turn
+
+    def session(self):
+        memory = self.engine.new_conversation() if self.multi_turn else None
+
+        def ask(question):
+            res = self.engine.generate_response(question, model=self.model, memory=memory)
+            if res["response"].startswith("Retrieval Error"):
+                raise RuntimeError(res["response"])
+            return res
+
+        return ask
+
+
+class HTTPTarget:
+    def __init__(self, url: str, model: str, timeout: float):
+        self.url = url
+        self.model = model
+        self.timeout = timeout
+
+    def session(self):
+        def ask(question):
+            req = urllib.request.Request(
+                self.url,
+                data=json.dumps({"query": question, "model": self.model}).encode(),
+                headers={"Content-Type": "application/json"}
+            )
+            with urllib.request.urlopen(req, timeout=self.timeout) as res:
+                return json.loads(res.read())
+
+        return ask
+
+
+# -----------------------------
+# Load Generation
+# -----------------------------
+def percentile(values: list, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100 * (len(values) - 1))))]
+
+
+def run_stage(target, questions: list, users: int, duration: float, think: float) -> dict:
+    latencies, errors = [], []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def user(seed):
+        rng = random.Random(seed)
+        ask = target.session()
+        while time.perf_counter() < stop_at:
+            question = rng.choice(questions)
+            start = time.perf_counter()
+            try:
+                ask(question)
+                with lock:
+                    latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                with lock:
+                    errors.append(str(e))
+            if think:
+                time.sleep(rng.expovariate(1 / think))
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=user, args=(i,), daemon=True) for i in range(users)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    total = len(latencies) + len(errors)
+    return {
+        "users": users,
+        "requests": total,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_s": percentile(latencies, 50),
+        "p95_s": percentile(latencies, 95),
+        "p99_s": percentile(latencies, 99),
+        "error_rate": len(errors) / total if total else 0.0,
+        "sample_error": errors[0] if errors else None,
+    }
+
+
+def find_saturation(stages: list, max_error_rate: float = 0.05):
+    """First stage where throughput grows by less than half the user
+    increase while p95 latency climbs >50%, or errors exceed max_error_rate."""
+    for prev, cur in zip(stages, stages[1:]):
+        user_gain = cur["users"] / prev["users"]
+        rps_gain = cur["throughput_rps"] / prev["throughput_rps"] if prev["throughput_rps"] else 0.0
+        flat = rps_gain - 1 < 0.5 * (user_gain - 1)
+        slower = cur["p95_s"] > prev["p95_s"] * 1.5
+        if (flat and slower) or cur["error_rate"] > max_error_rate:
+            return {"saturated_at_users": cur["users"], "max_sustainable_users": prev["users"]}
+    return {"saturated_at_users": None, "max_sustainable_users": stages[-1]["users"] if stages else None}
+
+
+def print_report(stages: list, saturation: dict):
+    print(f"{'users':>6} {'reqs':>6} {'rps':>7} {'p50 s':>7} {'p95 s':>7} {'p99 s':>7} {'errors':>7}")
+    for s in stages:
+        print(
+            f"{s['users']:>6} {s['requests']:>6} {s['throughput_rps']:>7.2f} "
+            f"{s['p50_s']:>7.2f} {s['p95_s']:>7.2f} {s['p99_s']:>7.2f} {s['error_rate']:>7.1%}"
+        )
+    if saturation["saturated_at_users"]:
+        print(
+            f"\nSaturation at {saturation['saturated_at_users']} users; "
+            f"max sustainable: {saturation['max_sustainable_users']} users"
+        )
+    else:
+        print(f"\nNo saturation up to {saturation['max_sustainable_users']} users")
+
+
+# -----------------------------
+# Stand-in HTTP Server
+# -----------------------------
+def serve(engine, port: int):
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            res = engine.generate_response(
+                body["query"],
+                model=body.get("model", Config.OLLAMA_MODEL)
+            )
+            payload = json.dumps(res, default=str).encode()
+            self.send_response(500 if res["response"].startswith("Retrieval Error") else 200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+
+    logger.info(f"Serving chat engine on http://localhost:{port}/chat")
+    ThreadingHTTPServer(("", port), Handler).serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-user load test for the chat service")
+    parser.add_argument("mode", nargs="?", choices=["run", "serve"], default="run")
+    parser.add_argument("--users", default="1,2,4,8,16", help="Comma-separated ramp of concurrent users")
+    parser.add_argument("--duration", type=float, default=20, help="Seconds per ramp stage")
+    parser.add_argument("--think", type=float, default=1.0, help="Mean think time between questions (s)")
+    parser.add_argument("--model", default=Config.OLLAMA_MODEL, help='Model name or "auto"')
+    parser.add_argument("--multi-turn", action="store_true", help="Keep conversation memory per user")
+    parser.add_argument("--no-fast-path", action="store_true")
+    parser.add_argument("--url", help="HTTP endpoint to test instead of the in-process engine")
+    parser.add_argument("--real", action="store_true", help="Use Pinecone/Ollama instead of stand-ins")
+    parser.add_argument("--retrieval-latency", type=float, default=0.05)
+    parser.add_argument("--llm-latency", type=float, default=1.5)
+    parser.add_argument("--llm-contention", type=float, default=0.5,
+                        help="Extra latency per concurrent generation (fraction of base)")
+    parser.add_argument("--llm-concurrency", type=int, default=Config.LLM_MAX_CONCURRENCY)
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+
+    if args.url:
+        target = HTTPTarget(args.url, args.model, timeout=Config.LLM_TIMEOUT)
+    else:
+        if args.real:
+            from src.rag import RAGEngine
+            engine = RAGEngine()
+        else:
+            engine = build_standin_engine(args)
+        engine.fast_path.enabled = not args.no_fast_path
+
+        if args.mode == "serve":
+            serve(engine, args.port)
+            return
+        target = InProcessTarget(engine, args.model, args.multi_turn)
+
+    questions = question_mix()
+    stages = []
+    for users in [int(u) for u in args.users.split(",")]:
+        logger.info(f"Stage: {users} users for {args.duration:.0f}s")
+        stages.append(run_stage(target, questions, users, args.duration, args.think))
+
+    saturation = find_saturation(stages)
+    print_report(stages, saturation)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"stages": stages, **saturation}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
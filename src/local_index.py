@@ -0,0 +1,147 @@
+import hashlib
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.metadata import MetadataIndex
+
+
+class LocalVectorStore:
+    """In-memory cosine index with the same search signature as the
+    LangChain Pinecone store, used for offline runs and tests."""
+
+    def __init__(self, embeddings):
+        self.embeddings = embeddings
+        self.documents = []
+        self.vectors = np.zeros((0, 0), dtype=np.float32)
+        self.metadata_index = MetadataIndex()
+
+    @classmethod
+    def from_documents(cls, documents, embedding):
+        store = cls(embedding)
+        store.add_documents(documents)
+        return store
+
+    def add_documents(self, documents):
+        if not documents:
+            return
+
+        vectors = np.asarray(
+            self.embeddings.embed_documents([d.page_content for d in documents]),
+            dtype=np.float32
+        )
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12
+
+        start = len(self.documents)
+        for i, doc in enumerate(documents):
+            self.metadata_index.add(start + i, doc.metadata or {})
+
+        self.documents.extend(documents)
+        self.vectors = vectors if start == 0 else np.vstack([self.vectors, vectors])
+
+    def _rows(self, filter):
+        # --- Pre-filter: only score rows that pass the metadata filter ---
+        candidates = self.metadata_index.candidates(filter)
+        if candidates is None:
+            return np.arange(len(self.documents))
+        return np.fromiter(sorted(candidates), dtype=np.int64)
+
+    def _embed_query(self, query: str):
+        query_vec = np.asarray(self.embeddings.embed_query(query), dtype=np.float32)
+        return query_vec / (np.linalg.norm(query_vec) + 1e-12)
+
+    def similarity_search_with_score(self, query: str, k: int = 4, filter=None):
+        rows = self._rows(filter) if self.documents else []
+        if not len(rows):
+            return []
+
+        query_vec = self._embed_query(query)
+        scores = self.vectors[rows] @ query_vec
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+
+        return [(self.documents[rows[i]], float(scores[i])) for i in top]
+
+    def similarity_search(self, query: str, k: int = 4, filter=None):
+        return [doc for doc, _ in self.similarity_search_with_score(query, k, filter)]
+
+    def max_marginal_relevance_search(self, query: str, k: int = 4, fetch_k: int = 20,
+                                      lambda_mult: float = 0.5, filter=None):
+        rows = self._rows(filter) if self.documents else []
+        if not len(rows):
+            return []
+
+        query_vec = self._embed_query(query)
+        scores = self.vectors[rows] @ query_vec
+        pool = rows[np.argsort(-scores)[:fetch_k]]
+        relevance = dict(zip(rows.tolist(), scores.tolist()))
+
+        selected = []
+        while pool.size and len(selected) < k:
+            if selected:
+                redundancy = (self.vectors[pool] @ self.vectors[selected].T).max(axis=1)
+            else:
+                redundancy = np.zeros(len(pool))
+            mmr = lambda_mult * np.array([relevance[r] for r in pool]) - (1 - lambda_mult) * redundancy
+            best = int(np.argmax(mmr))
+            selected.append(int(pool[best]))
+            pool = np.delete(pool, best)
+
+        return [self.documents[r] for r in selected]
+
+
+class CachedEmbeddings:
+    """Wraps an embeddings model and keeps document vectors on disk, keyed
+    by text hash, so repeated offline runs skip re-embedding."""
+
+    def __init__(self, embeddings, cache_path: str):
+        self.embeddings = embeddings
+        self.cache_path = Path(cache_path)
+        self.cache = {}
+        self.hits = 0
+        self.misses = 0
+        # Measured cost of embedding one text on a miss, kept with the cache
+        self.seconds_per_text = None
+
+        if self.cache_path.exists():
+            data = np.load(self.cache_path)
+            self.cache = dict(zip(data["keys"].tolist(), data["vectors"]))
+            if "seconds_per_text" in data:
+                self.seconds_per_text = float(data["seconds_per_text"])
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def embed_documents(self, texts: list) -> list:
+        keys = [self._key(t) for t in texts]
+        missing = [t for t, key in zip(texts, keys) if key not in self.cache]
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            start = time.perf_counter()
+            vectors = self.embeddings.embed_documents(missing)
+            self.seconds_per_text = (time.perf_counter() - start) / len(missing)
+            for text, vec in zip(missing, vectors):
+                self.cache[self._key(text)] = np.asarray(vec, dtype=np.float32)
+
+        return [self.cache[key] for key in keys]
+
+    def embed_query(self, text: str) -> list:
+        # Queries are embedded live so measured query latency stays honest
+        return self.embeddings.embed_query(text)
+
+    def save(self):
+        if not self.cache:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        keys = list(self.cache)
+        np.savez(
+            self.cache_path,
+            keys=np.array(keys),
+            vectors=np.stack([self.cache[k] for k in keys]),
+            **({"seconds_per_text": self.seconds_per_text} if self.seconds_per_text else {})
+        )
@@ -0,0 +1,229 @@
+import logging
+import re
+
+from src.config import Config
+from src.scheduler import BATCH, INTERACTIVE
+
+logger = logging.getLogger(__name__)
+
+# Follow-ups that lean on earlier turns ("what problem did it solve?"):
+# pronouns whose referent is not named in the question itself
+_PRONOUN = re.compile(
+    r"\b(it|its|they|them|their|theirs|he|him|his|she|her|hers)\b",
+    re.IGNORECASE
+)
+# "What did this solve?", "Who built that?": a demonstrative right after
+# the question word stands in for the subject
+_DEMONSTRATIVE = re.compile(
+    r"^\s*(what|which|who|whom|why|how|when|where)\b(\s+\w+)?\s+(this|that|these|those)\b",
+    re.IGNORECASE
+)
+# A capitalised name or acronym after the first word ("... MMTT ...")
+_NAMED_ENTITY = re.compile(r"(?<!^)\b[A-Z][A-Za-z0-9]+")
+_FOLLOW_UP = re.compile(r"^\s*(and|also|what about|how about)\b", re.IGNORECASE)
+
+_SUMMARY_PROMPT = """Update the running summary of a conversation about the MMTT project.
+Keep names, facts and open questions. Reply with the summary only, at most {limit} words.
+
+Current summary:
+{summary}
+
+New turns:
+{turns}
+"""
+
+_REWRITE_PROMPT = """Rewrite the follow-up question so it can be understood without the conversation.
+Reply with the rewritten question only.
+
+Conversation:
+{history}
+
+Follow-up question:
+{question}
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    # ~4 characters per token is close enough for budgeting
+    return max(1, len(text) // 4)
+
+
+def _format_turns(turns: list) -> str:
+    return "\n".join(
+        f"{'User' if role == 'user' else 'Assistant'}: {content}"
+        for role, content in turns
+    )
+
+
+class ConversationMemory:
+    """Keeps recent turns verbatim within a token budget and folds turns
+    that fall out of it into a cached running summary. Folding runs as a
+    BATCH job on the scheduler and is collected on a later turn, so it
+    never delays the answer being served."""
+
+    def __init__(
+        self,
+        scheduler=None,
+        model: str = Config.MEMORY_MODEL,
+        turn_budget: int = Config.MEMORY_TURN_TOKENS,
+        summary_budget: int = Config.MEMORY_SUMMARY_TOKENS,
+    ):
+        self.scheduler = scheduler
+        self.model = model
+        self.turn_budget = turn_budget
+        self.summary_budget = summary_budget
+
+        self.turns = []          # [(role, content)] kept verbatim
+        self.summary = ""
+        self.summary_updates = 0
+
+        self.pending = []        # evicted, not yet sent for summarising
+        self._folding = []       # evicted, summary job in flight
+        self._fold_ticket = None
+
+    def clear(self):
+        if self._fold_ticket is not None:
+            self._fold_ticket.cancel()
+        self.turns = []
+        self.summary = ""
+        self.pending = []
+        self._folding = []
+        self._fold_ticket = None
+
+    # -----------------------------
+    # Turns + Summary
+    # -----------------------------
+    def add_turn(self, role: str, content: str):
+        self.turns.append((role, content))
+
+        while len(self.turns) > 1 and self._turn_tokens() > self.turn_budget:
+            self.pending.append(self.turns.pop(0))
+
+        self._collect_fold()
+        self._start_fold()
+
+    def _turn_tokens(self) -> int:
+        return sum(estimate_tokens(content) for _, content in self.turns)
+
+    def _start_fold(self):
+        if not self.pending or self._fold_ticket is not None:
+            return
+
+        if self.scheduler is None:
+            self._append_extractive(self.pending)
+            self.pending = []
+            return
+
+        # Only the previous summary and the newly evicted turns are sent,
+        # never the full history
+        self._folding, self.pending = self.pending, []
+        self._fold_ticket = self.scheduler.submit(
+            self.model,
+            [{
+                "role": "user",
+                "content": _SUMMARY_PROMPT.format(
+                    limit=self.summary_budget * 3 // 4,   # tokens -> words
+                    summary=self.summary or "(empty)",
+                    turns=_format_turns(self._folding)
+                )
+            }],
+            priority=BATCH
+        )
+
+    def _collect_fold(self):
+        ticket = self._fold_ticket
+        if ticket is None or not ticket.done():
+            return
+
+        # Nothing else writes the summary while a fold is in flight, so the
+        # result can replace it without losing turns
+        try:
+            self.summary = self._capped(ticket.result().strip())
+            self.summary_updates += 1
+        except Exception as e:
+            logger.error(f"Summary update failed, keeping extractive fallback: {e}")
+            self._append_extractive(self._folding)
+
+        self._folding = []
+        self._fold_ticket = None
+
+    def _append_extractive(self, turns: list):
+        self.summary = self._capped(f"{self.summary}\n{_format_turns(turns)}".strip())
+        self.summary_updates += 1
+
+    def _capped(self, summary: str) -> str:
+        # Hard cap so the prompt stays bounded whatever the model returns
+        max_chars = self.summary_budget * 4
+        return summary[-max_chars:] if len(summary) > max_chars else summary
+
+    def history(self) -> str:
+        """Summary (at most summary_budget tokens) plus the newest turns
+        not yet summarised, verbatim up to turn_budget tokens."""
+        self._collect_fold()
+        self._start_fold()
+
+        unsummarized = self._folding + self.pending + self.turns
+        verbatim, tokens = [], 0
+        for role, content in reversed(unsummarized):
+            tokens += estimate_tokens(content)
+            if verbatim and tokens > self.turn_budget:
+                break
+            verbatim.insert(0, (role, content))
+
+        # Older turns still waiting on a fold are shown extractively for this
+        # prompt only; the stored summary picks them up when their fold lands
+        overflow = unsummarized[:len(unsummarized) - len(verbatim)]
+        summary = self.summary
+        if overflow:
+            summary = self._capped(f"{summary}\n{_format_turns(overflow)}".strip())
+
+        parts = []
+        if summary:
+            parts.append(f"Summary of earlier conversation:\n{summary}")
+        if verbatim:
+            parts.append(_format_turns(verbatim))
+        return "\n\n".join(parts)
+
+    # -----------------------------
+    # Query Rewriting
+    # -----------------------------
+    def needs_rewrite(self, query: str) -> bool:
+        if not (self.turns or self.summary or self.pending or self._folding):
+            return False
+        if _FOLLOW_UP.search(query):
+            return True
+        # "what problem did it solve?" yes; "what is MMTT and who built it?" no
+        unresolved = _PRONOUN.search(query) or _DEMONSTRATIVE.search(query)
+        return bool(unresolved) and not _NAMED_ENTITY.search(query.strip())
+
+    def rewrite(self, query: str) -> str:
+        """Standalone version of a follow-up, used for retrieval only.
+        Self-contained questions are returned unchanged without an LLM call."""
+        if not self.needs_rewrite(query):
+            return query
+
+        if self.scheduler is not None:
+            try:
+                rewritten = self.scheduler.chat(
+                    self.model,
+                    [{
+                        "role": "user",
+                        "content": _REWRITE_PROMPT.format(
+                            history=self.history(),
+                            question=query
+                        )
+                    }],
+                    priority=INTERACTIVE
+                ).strip()
+                if rewritten:
+                    return rewritten
+            except Exception as e:
+                logger.error(f"Query rewrite failed, using fallback: {e}")
+
+        # Fallback: carry the previous user question along for retrieval
+        previous = next((c for r, c in reversed(self.turns) if r == "user"), "")
+        return f"{previous} {query}".strip()
+
+    def prompt_tokens(self) -> int:
+        history = self.history()
+        return estimate_tokens(history) if history else 0
@@ -0,0 +1,209 @@
+import re
+from pathlib import Path
+from urllib.parse import urlparse
+
+from langchain_core.documents import Document
+from langchain_text_splitters import CharacterTextSplitter
+
+from src.config import Config
+
+
+# -----------------------------
+# Metadata Fields
+# -----------------------------
+# Every chunk carries these keys so they can be pushed down to Pinecone
+# metadata filters or indexed locally by MetadataIndex.
+FILTER_FIELDS = ("doc_type", "site", "source", "section")
+
+# Sidebar scopes -> retrieval filters (None = whole corpus)
+SCOPES = {
+    "All sources": None,
+    "Documentation": {"doc_type": "docs"},
+    "Website pages": {"doc_type": "website"},
+    "Team": {"doc_type": "team"},
+    "Links": {"doc_type": "links"},
+}
+
+_URL_MARKERS = [
+    # playmetrics_full_dataset.txt
+    re.compile(r"^SOURCE URL:\s*\n(https?://\S+)\s*$", re.MULTILINE),
+    # website_text.txt (extracter.py output)
+    re.compile(r"^--- (https?://\S+) ---\s*$", re.MULTILINE),
+]
+_UNDERLINE = re.compile(r"^\s*[-=]{3,}\s*$")
+
+
+def _doc_type(file_name: str, source: str) -> str:
+    name = file_name.lower()
+    if "team" in name:
+        return "team"
+    if "links" in name:
+        return "links"
+    if urlparse(source).path.rstrip("/").endswith("/docs"):
+        return "docs"
+    return "website"
+
+
+def _site(source: str) -> str:
+    return urlparse(source).netloc or "local"
+
+
+def _is_heading(line: str, next_line: str) -> bool:
+    line = line.strip()
+    if not line or _UNDERLINE.match(line) or len(line) > 80:
+        return False
+    if _UNDERLINE.match(next_line):
+        return True
+    # Upper-case banners, e.g. "EXECUTIVE SUMMARY"
+    letters = [c for c in line if c.isalpha()]
+    return len(letters) >= 4 and line.upper() == line
+
+
+def _headings(text: str) -> list:
+    """(offset, heading) pairs in document order."""
+    found = []
+    lines = text.splitlines(keepends=True)
+    offset = 0
+    for i, line in enumerate(lines):
+        next_line = lines[i + 1] if i + 1 < len(lines) else ""
+        if _is_heading(line, next_line):
+            found.append((offset, line.strip()))
+        offset += len(line)
+    return found
+
+
+def _segments(text: str, path: Path) -> list:
+    """Split a file into (source, text) blocks, one per scraped URL."""
+    for pattern in _URL_MARKERS:
+        matches = list(pattern.finditer(text))
+        if not matches:
+            continue
+
+        segments = []
+        head = text[:matches[0].start()]
+        if head.strip():
+            segments.append((str(path), head))
+        for i, m in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            segments.append((m.group(1), text[m.end():end]))
+        return segments
+
+    return [(str(path), text)]
+
+
+# -----------------------------
+# Loading + Chunking
+# -----------------------------
+def load_chunks(
+    data_dir: str = Config.DATA_DIR,
+    chunk_size: int = Config.CHUNK_SIZE,
+    chunk_overlap: int = Config.CHUNK_OVERLAP,
+) -> list:
+    splitter = CharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        add_start_index=True
+    )
+
+    chunks = []
+    for path in sorted(Path(data_dir).glob("*.txt")):
+        text = path.read_text(encoding="utf-8", errors="ignore")
+
+        for source, segment in _segments(text, path):
+            headings = _headings(segment)
+            base = Document(
+                page_content=segment,
+                metadata={
+                    "file": path.name,
+                    "source": source,
+                    "site": _site(source),
+                    "doc_type": _doc_type(path.name, source),
+                }
+            )
+
+            for chunk in splitter.split_documents([base]):
+                start = chunk.metadata.pop("start_index", 0)
+                section = ""
+                for offset, heading in headings:
+                    if offset > start + len(chunk.page_content) // 2:
+                        break
+                    section = heading
+                chunk.metadata["section"] = section
+                chunks.append(chunk)
+
+    return chunks
+
+
+# -----------------------------
+# Filters
+# -----------------------------
+def normalize_filters(filters) -> dict:
+    """Accept {"field": value}, {"field": [values]} or Pinecone-style
+    {"field": {"$eq"/"$in": ...}} and return {"field": set(values)}."""
+    normalized = {}
+    for field, value in (filters or {}).items():
+        if isinstance(value, dict):
+            if "$eq" in value:
+                value = [value["$eq"]]
+            elif "$in" in value:
+                value = value["$in"]
+            else:
+                raise ValueError(f"Unsupported filter operator for {field}: {value}")
+        elif isinstance(value, (str, int, float, bool)):
+            value = [value]
+        normalized[field] = set(value)
+    return normalized
+
+
+def to_pinecone_filter(filters):
+    if not filters:
+        return None
+
+    pushed = {}
+    for field, values in normalize_filters(filters).items():
+        values = sorted(values)
+        if len(values) == 1:
+            pushed[field] = {"$eq": values[0]}
+        else:
+            pushed[field] = {"$in": values}
+    return pushed
+
+
+class MetadataIndex:
+    """Per-field inverted index (value -> set of row ids) so local search
+    can narrow the candidate set before any similarity is computed."""
+
+    def __init__(self, fields=FILTER_FIELDS):
+        self.fields = fields
+        self.postings = {field: {} for field in fields}
+        self.size = 0
+
+    def add(self, row_id: int, metadata: dict):
+        for field in self.fields:
+            value = metadata.get(field)
+            if value is None:
+                continue
+            self.postings[field].setdefault(value, set()).add(row_id)
+        self.size = max(self.size, row_id + 1)
+
+    def candidates(self, filters):
+        """Row ids matching every field (AND) and any value (OR), or None
+        when there is nothing to filter on."""
+        filters = normalize_filters(filters)
+        if not filters:
+            return None
+
+        result = None
+        for field, values in filters.items():
+            if field not in self.postings:
+                raise ValueError(f"Field is not indexed: {field}")
+            ids = set()
+            for value in values:
+                ids |= self.postings[field].get(value, set())
+            result = ids if result is None else result & ids
+            if not result:
+                break
+        return result
+
+    def values(self, field: str) -> list:
+        return sorted(self.postings.get(field, {}))
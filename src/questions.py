@@ -0,0 +1,18 @@
+import re
+
+# Shared question classification used by the fast path and the model router
+
+REASONING = re.compile(
+    r"\b(why|how|explain|compare|comparison|difference|differ|summari[sz]e|"
+    r"describe|analy[sz]e|advantages?|disadvantages?|impact|pros|cons)\b",
+    re.IGNORECASE
+)
+LOOKUP = re.compile(
+    r"^\s*(who|what is|what's|when|where|which|list|name|url|link)\b",
+    re.IGNORECASE
+)
+
+
+def is_lookup(query: str) -> bool:
+    """Who/what-is/where/link style question with no reasoning words."""
+    return bool(LOOKUP.search(query)) and not REASONING.search(query)
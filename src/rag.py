@@ -1,44 +1,52 @@
-import pinecone
-from langchain_ollama import ChatOllama, OllamaEmbeddings
-from langchain_community.vectorstores import Pinecone as LangchainPinecone
+import time
+
 from langchain_core.prompts import ChatPromptTemplate
-from langchain_core.output_parsers import StrOutputParser
 
 from src.config import Config
+from src.fastpath import FastPath
+from src.memory import ConversationMemory
+from src.metadata import to_pinecone_filter
+from src.router import AUTO_MODEL, ModelRouter
+from src.scheduler import INTERACTIVE, get_scheduler
 
 
 class RAGEngine:
-    def __init__(self):
-        # --- Validate Config ---
-        if not Config.PINECONE_API_KEY:
-            raise ValueError("Missing PINECONE_API_KEY")
-
-        # --- Init Pinecone (VECTOR DB ONLY) ---
-        pinecone.init(
-            api_key=Config.PINECONE_API_KEY,
-            environment=Config.PINECONE_ENV
-        )
-
-        # --- Ollama LLM ---
-        self.llm = ChatOllama(
-            model=Config.OLLAMA_MODEL,
-            temperature=0.4
-        )
-
-        # --- Ollama Embeddings ---
-        self.embeddings = OllamaEmbeddings(
-            model=Config.OLLAMA_MODEL
-        )
-
-        # --- Connect Existing Index ---
-        self.vectorstore = LangchainPinecone.from_existing_index(
-            index_name=Config.PINECONE_INDEX_NAME,
-            embedding=self.embeddings
-        )
-
-        self.retriever = self.vectorstore.as_retriever(
-            search_kwargs={"k": Config.TOP_K}
-        )
+    def __init__(self, vectorstore=None, scheduler=None):
+        # vectorstore / scheduler can be injected (e.g. local stand-ins for
+        # load tests); by default connect to Pinecone and the shared Ollama queue
+
+        # --- Ollama LLM (shared scheduler: concurrency caps, queueing, coalescing) ---
+        self.scheduler = scheduler or get_scheduler()
+        self.llm_options = {"temperature": 0.4}
+
+        if vectorstore is None:
+            # Production stack is imported here so injected stand-ins run without it
+            import pinecone
+            from langchain_ollama import OllamaEmbeddings
+            from langchain_community.vectorstores import Pinecone as LangchainPinecone
+
+            # --- Validate Config ---
+            if not Config.PINECONE_API_KEY:
+                raise ValueError("Missing PINECONE_API_KEY")
+
+            # --- Init Pinecone (VECTOR DB ONLY) ---
+            pinecone.init(
+                api_key=Config.PINECONE_API_KEY,
+                environment=Config.PINECONE_ENV
+            )
+
+            # --- Ollama Embeddings ---
+            self.embeddings = OllamaEmbeddings(
+                model=Config.OLLAMA_MODEL
+            )
+
+            # --- Connect Existing Index ---
+            vectorstore = LangchainPinecone.from_existing_index(
+                index_name=Config.PINECONE_INDEX_NAME,
+                embedding=self.embeddings
+            )
+
+        self.vectorstore = vectorstore
 
         # --- Prompt ---
         self.prompt = ChatPromptTemplate.from_template("""
@@ -46,6 +54,9 @@ You are a technical assistant.
 Answer ONLY using the context below.
 If the answer is not present, say "I don't know".
 
+Conversation so far:
+{history}
+
 Context:
 {context}
 
@@ -53,39 +64,95 @@ Question:
 {question}
 """)
 
-        self.parser = StrOutputParser()
+        self.fast_path = FastPath()
+        self.router = ModelRouter()
+
+    def new_conversation(self) -> ConversationMemory:
+        return ConversationMemory(scheduler=self.scheduler)
+
+    # -----------------------------
+    # Retrieval
+    # -----------------------------
+    def retrieve(self, query: str, filters: dict = None) -> list:
+        # Filters are pushed down to Pinecone so only matching chunks are scored
+        return self.vectorstore.similarity_search_with_score(
+            query,
+            k=Config.TOP_K,
+            filter=to_pinecone_filter(filters)
+        )
 
     # -----------------------------
     # Main RAG Method
     # -----------------------------
-    def generate_response(self, query: str) -> dict:
+    def generate_response(self, query: str, filters: dict = None,
+                          priority: int = INTERACTIVE,
+                          model: str = Config.OLLAMA_MODEL,
+                          memory: ConversationMemory = None) -> dict:
         try:
-            docs = self.retriever.get_relevant_documents(query)
-
+            # Follow-ups are rewritten into standalone questions for retrieval
+            search_query = memory.rewrite(query) if memory else query
+            scored_docs = self.retrieve(search_query, filters)
+
+            # --- Fast path: skip the LLM when the top chunk already answers ---
+            fast = self.fast_path.try_answer(search_query, scored_docs)
+            if fast:
+                if memory:
+                    memory.add_turn("user", query)
+                    memory.add_turn("assistant", fast["response"])
+                return fast
+
+            docs = [d for d, _ in scored_docs]
             context = "\n\n".join(d.page_content for d in docs)
 
-            chain = self.prompt | self.llm | self.parser
-            response = chain.invoke({
-                "context": context,
-                "question": query
-            })
+            messages = [{
+                "role": "user",
+                "content": self.prompt.format_messages(
+                    history=(memory.history() if memory else "") or "(none)",
+                    context=context,
+                    question=query
+                )[0].content
+            }]
+
+            def ask(llm_model):
+                return self.scheduler.chat(
+                    llm_model,
+                    messages,
+                    priority=priority,
+                    options=self.llm_options
+                )
+
+            start = time.perf_counter()
+            if model == AUTO_MODEL:
+                routed = self.router.run(search_query, scored_docs, ask)
+                response, model = routed["response"], routed["model"]
+            else:
+                response = ask(model)
+            self.fast_path.record_llm(time.perf_counter() - start)
+
+            if memory:
+                memory.add_turn("user", query)
+                memory.add_turn("assistant", response)
 
             sources = []
             for d in docs:
                 meta = d.metadata or {}
                 if "source" in meta:
                     sources.append({
-                        "title": meta.get("title", "Source"),
-                        "url": meta.get("source")
+                        "title": meta.get("title") or meta.get("section") or "Source",
+                        "url": meta.get("source"),
+                        "doc_type": meta.get("doc_type")
                     })
 
             return {
                 "response": response,
-                "sources": sources
+                "sources": sources,
+                "fast_path": False,
+                "model": model
             }
 
         except Exception as e:
             return {
                 "response": f"Retrieval Error: {e}",
-                "sources": []
+                "sources": [],
+                "fast_path": False
             }
@@ -0,0 +1,124 @@
+import logging
+import re
+import threading
+import time
+
+from src.config import Config
+from src.questions import LOOKUP, REASONING
+
+logger = logging.getLogger(__name__)
+
+# Model selector value that turns on routing
+AUTO_MODEL = "auto"
+
+_LOW_CONFIDENCE = re.compile(
+    r"(i don['’]?t know|i do not know|don['’]?t have enough information|"
+    r"not (mentioned|provided|available|specified) in the (context|text)|"
+    r"cannot (answer|determine)|can['’]t (answer|determine)|i['’]?m not sure|unclear)",
+    re.IGNORECASE
+)
+
+
+def is_low_confidence(answer: str) -> bool:
+    return not answer or len(answer.strip()) < 3 or bool(_LOW_CONFIDENCE.search(answer))
+
+
+class ModelRouter:
+    """Sends each question to the cheapest model in Config.LLM_MODELS
+    (ordered cheapest first) that is likely to suffice, escalating when
+    the answer comes back as "I don't know"."""
+
+    def __init__(
+        self,
+        models: list = Config.LLM_MODELS,
+        max_escalations: int = Config.ROUTER_MAX_ESCALATIONS,
+    ):
+        self.models = list(models)
+        self.max_escalations = max_escalations
+
+        self._lock = threading.Lock()
+        self.routed = 0
+        self.escalations = 0
+        self.calls = {m: 0 for m in self.models}
+        self.seconds = {m: 0.0 for m in self.models}
+
+    # -----------------------------
+    # Routing Signals
+    # -----------------------------
+    def complexity(self, query: str, scored_docs: list = None) -> int:
+        score = 0
+
+        if len(query.split()) > 20:
+            score += 1
+
+        if REASONING.search(query):
+            score += 1
+        elif not LOOKUP.search(query):
+            score += 1 if len(query.split()) > 8 else 0
+
+        # Weak or flat retrieval means the model has to do more of the work
+        scores = [s for _, s in scored_docs or []]
+        if scores:
+            spread = scores[0] - sum(scores[1:]) / max(len(scores) - 1, 1)
+            if scores[0] < Config.ROUTER_MIN_TOP_SCORE or (
+                len(scores) > 1 and spread < Config.ROUTER_MIN_SPREAD
+            ):
+                score += 1
+
+        return score
+
+    def choose(self, query: str, scored_docs: list = None) -> int:
+        """Index into self.models of the starting model."""
+        return min(self.complexity(query, scored_docs), len(self.models) - 1)
+
+    # -----------------------------
+    # Run With Escalation
+    # -----------------------------
+    def run(self, query: str, scored_docs: list, ask) -> dict:
+        """ask(model) -> answer text. Returns the answer with the model used."""
+        tier = self.choose(query, scored_docs)
+        escalated = 0
+
+        while True:
+            model = self.models[tier]
+            start = time.perf_counter()
+            answer = ask(model)
+            self._record(model, time.perf_counter() - start)
+
+            if (
+                not is_low_confidence(answer)
+                or tier == len(self.models) - 1
+                or escalated >= self.max_escalations
+            ):
+                break
+
+            logger.info(f"Escalating from {model}: low-confidence answer to {query!r}")
+            tier += 1
+            escalated += 1
+
+        with self._lock:
+            self.routed += 1
+            if escalated:
+                self.escalations += 1
+
+        return {"response": answer, "model": model, "escalated": escalated > 0}
+
+    def _record(self, model: str, seconds: float):
+        with self._lock:
+            self.calls[model] = self.calls.get(model, 0) + 1
+            self.seconds[model] = self.seconds.get(model, 0.0) + seconds
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "routed": self.routed,
+                "escalations": self.escalations,
+                "escalation_rate": self.escalations / self.routed if self.routed else 0.0,
+                "models": {
+                    m: {
+                        "calls": self.calls[m],
+                        "avg_seconds": self.seconds[m] / self.calls[m] if self.calls[m] else 0.0
+                    }
+                    for m in self.calls
+                }
+            }
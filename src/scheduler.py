@@ -0,0 +1,232 @@
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+
+import ollama
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+# Lower value = served first
+INTERACTIVE = 0
+BATCH = 10
+
+
+class CancelledError(Exception):
+    pass
+
+
+def ollama_chat(model: str, messages: list, options: dict = None) -> str:
+    res = ollama.chat(model=model, messages=messages, options=options)
+    return res["message"]["content"]
+
+
+class _Job:
+    def __init__(self, key, model, messages, options, priority, seq):
+        self.key = key
+        self.model = model
+        self.messages = messages
+        self.options = options
+        self.priority = priority
+        self.seq = seq
+        self.state = "queued"           # queued -> running -> done | cancelled
+        self.waiters = 0
+        self.enqueued_at = time.perf_counter()
+        self.finished = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class Ticket:
+    """One caller's handle on a (possibly shared) generation."""
+
+    def __init__(self, scheduler, job):
+        self._scheduler = scheduler
+        self._job = job
+        self._released = False
+
+    def done(self) -> bool:
+        return self._job.finished.is_set()
+
+    def result(self, timeout: float = None) -> str:
+        if not self._job.finished.wait(timeout):
+            self._scheduler._release(self, "timeout")
+            raise TimeoutError(f"LLM request timed out after {timeout}s")
+        if self._job.error:
+            raise self._job.error
+        return self._job.result
+
+    def cancel(self, reason: str = "cancelled"):
+        self._scheduler._release(self, reason)
+
+
+class LLMScheduler:
+    """Sits in front of the LLM: caps concurrent generations per model,
+    serves queued requests by priority (interactive before batch) and
+    coalesces identical in-flight prompts onto a single generation."""
+
+    def __init__(
+        self,
+        max_concurrency=Config.LLM_MAX_CONCURRENCY,
+        timeout: float = Config.LLM_TIMEOUT,
+        generate=ollama_chat,
+    ):
+        # int for every model, or {model: limit} with an optional "default"
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.generate = generate
+
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+        self._queues = {}        # model -> heap of (priority, seq, job)
+        self._running = {}       # model -> running generations
+        self._inflight = {}      # key -> job (queued or running)
+        self._waits = deque(maxlen=1000)
+        self._counters = {
+            "submitted": 0,
+            "coalesced": 0,
+            "completed": 0,
+            "failed": 0,
+            "timeouts": 0,
+            "cancelled": 0,
+        }
+
+    def _limit(self, model: str) -> int:
+        if isinstance(self.max_concurrency, dict):
+            return self.max_concurrency.get(
+                model, self.max_concurrency.get("default", 1)
+            )
+        return self.max_concurrency
+
+    # -----------------------------
+    # Submit / Wait
+    # -----------------------------
+    def submit(self, model: str, messages: list, priority: int = INTERACTIVE,
+               options: dict = None) -> Ticket:
+        key = json.dumps([model, messages, options], sort_keys=True)
+
+        with self._lock:
+            self._counters["submitted"] += 1
+            job = self._inflight.get(key)
+
+            if job is not None:
+                self._counters["coalesced"] += 1
+                if job.state == "queued" and priority < job.priority:
+                    # Re-push with the better priority; the stale entry is skipped
+                    job.priority = priority
+                    heapq.heappush(self._queues[model], (priority, next(self._seq), job))
+            else:
+                job = _Job(key, model, messages, options, priority, next(self._seq))
+                self._inflight[key] = job
+                heapq.heappush(self._queues.setdefault(model, []), (priority, job.seq, job))
+
+            job.waiters += 1
+            ticket = Ticket(self, job)
+            self._dispatch(model)
+
+        return ticket
+
+    def chat(self, model: str, messages: list, priority: int = INTERACTIVE,
+             options: dict = None, timeout: float = None) -> str:
+        ticket = self.submit(model, messages, priority, options)
+        try:
+            return ticket.result(timeout or self.timeout)
+        finally:
+            if not ticket.done():
+                ticket.cancel()
+
+    def _release(self, ticket: Ticket, reason: str):
+        with self._lock:
+            if ticket._released:
+                return
+            ticket._released = True
+
+            job = ticket._job
+            if job.finished.is_set():
+                return
+
+            self._counters["timeouts" if reason == "timeout" else "cancelled"] += 1
+            job.waiters -= 1
+            if job.waiters == 0 and job.state == "queued":
+                # Nobody is waiting any more: drop it before it reaches the model
+                job.state = "cancelled"
+                job.error = CancelledError("LLM request cancelled")
+                self._inflight.pop(job.key, None)
+                job.finished.set()
+
+    # -----------------------------
+    # Dispatch (called with lock held)
+    # -----------------------------
+    def _dispatch(self, model: str):
+        queue = self._queues.get(model, [])
+        while queue and self._running.get(model, 0) < self._limit(model):
+            _, _, job = heapq.heappop(queue)
+            if job.state != "queued":
+                continue
+
+            job.state = "running"
+            self._running[model] = self._running.get(model, 0) + 1
+            self._waits.append(time.perf_counter() - job.enqueued_at)
+
+            threading.Thread(target=self._run, args=(job,), daemon=True).start()
+
+    def _run(self, job: _Job):
+        try:
+            job.result = self.generate(job.model, job.messages, job.options)
+            outcome = "completed"
+        except Exception as e:
+            logger.error(f"LLM generation failed on {job.model}: {e}")
+            job.error = e
+            outcome = "failed"
+
+        with self._lock:
+            job.state = "done"
+            self._counters[outcome] += 1
+            self._running[job.model] -= 1
+            self._inflight.pop(job.key, None)
+            job.finished.set()
+            self._dispatch(job.model)
+
+    # -----------------------------
+    # Metrics
+    # -----------------------------
+    def queue_depth(self, model: str = None) -> int:
+        with self._lock:
+            models = [model] if model else list(self._queues)
+            # A job may sit in the heap twice after a priority upgrade
+            return len({
+                id(job) for m in models
+                for _, _, job in self._queues.get(m, [])
+                if job.state == "queued"
+            })
+
+    def metrics(self) -> dict:
+        depth = self.queue_depth()
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                **self._counters,
+                "queue_depth": depth,
+                "running": sum(self._running.values()),
+                "avg_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+                "p95_wait_seconds": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                "max_wait_seconds": waits[-1] if waits else 0.0,
+            }
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> LLMScheduler:
+    """Process-wide scheduler so every session shares the same limits."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LLMScheduler()
+        return _scheduler
@@ -0,0 +1,222 @@
+"""Retrieval parameter sweep: recall vs latency.
+
+For every chunk_size x chunk_overlap x k x retrieval mode, builds a local
+index over data/*.txt and scores it against a labeled question -> relevant
+passage set, reporting recall@k and MRR next to index build time, query
+latency and prompt tokens per answer. Build time is measured with a warm
+embedding cache; cold build time adds the measured per-chunk embedding cost.
+
+    python -m src.sweep --chunk-sizes 250,500,1000 --overlaps 0,100 --ks 1,3,5
+    python -m src.sweep --min-recall 0.9 --json sweep.json
+"""
+import argparse
+import itertools
+import json
+import logging
+import re
+import time
+from pathlib import Path
+
+from src.config import Config
+from src.local_index import CachedEmbeddings, LocalVectorStore
+from src.memory import estimate_tokens
+from src.metadata import load_chunks
+
+logger = logging.getLogger(__name__)
+
+MODES = ("similarity", "mmr")
+
+# Instruction + question wrapper around the retrieved context (see RAGEngine.prompt)
+_PROMPT_OVERHEAD_TOKENS = 40
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def load_eval_set(path: str) -> list:
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)
+    return [
+        {"question": item["question"], "passages": [_normalize(p) for p in item["passages"]]}
+        for item in items
+    ]
+
+
+def load_embeddings(name: str):
+    if name == "hashing":
+        from src.loadtest import HashingEmbeddings
+        return HashingEmbeddings()
+
+    from langchain_community.embeddings import HuggingFaceEmbeddings
+    return HuggingFaceEmbeddings(model_name=name)
+
+
+# -----------------------------
+# Scoring
+# -----------------------------
+def score_question(docs: list, passages: list) -> tuple:
+    """(recall, reciprocal rank) for one question. A chunk is relevant if
+    it contains one of the labeled passages."""
+    texts = [_normalize(d.page_content) for d in docs]
+
+    found = {p for p in passages if any(p in t for t in texts)}
+    recall = len(found) / len(passages)
+
+    rank = next(
+        (i + 1 for i, t in enumerate(texts) if any(p in t for p in passages)),
+        None
+    )
+    return recall, 1 / rank if rank else 0.0
+
+
+def search(store, mode: str, question: str, k: int) -> list:
+    if mode == "mmr":
+        return store.max_marginal_relevance_search(question, k=k, fetch_k=max(20, 4 * k))
+    return store.similarity_search(question, k=k)
+
+
+def evaluate(store, eval_set: list, mode: str, k: int) -> dict:
+    recalls, rrs, latencies, tokens = [], [], [], []
+
+    for item in eval_set:
+        start = time.perf_counter()
+        docs = search(store, mode, item["question"], k)
+        latencies.append(time.perf_counter() - start)
+
+        recall, rr = score_question(docs, item["passages"])
+        recalls.append(recall)
+        rrs.append(rr)
+
+        context = "\n\n".join(d.page_content for d in docs)
+        tokens.append(
+            estimate_tokens(context) + estimate_tokens(item["question"]) + _PROMPT_OVERHEAD_TOKENS
+        )
+
+    n = len(eval_set)
+    return {
+        "recall_at_k": sum(recalls) / n,
+        "mrr": sum(rrs) / n,
+        "query_ms": 1000 * sum(latencies) / n,
+        "prompt_tokens": sum(tokens) / n,
+    }
+
+
+# -----------------------------
+# Sweep
+# -----------------------------
+def sweep(args) -> list:
+    eval_set = load_eval_set(args.eval_set)
+    embeddings = CachedEmbeddings(
+        load_embeddings(args.embeddings),
+        Path(args.cache_dir) / (re.sub(r"[^A-Za-z0-9]+", "_", args.embeddings) + ".npz")
+    )
+
+    ints = lambda s: [int(x) for x in s.split(",")]
+    results = []
+
+    settings = [
+        (size, overlap)
+        for size, overlap in itertools.product(ints(args.chunk_sizes), ints(args.overlaps))
+        if overlap < size
+    ]
+
+    try:
+        # Warm the cache for every setting first so build times below are all
+        # measured the same way (warm cache) regardless of loop order
+        for chunk_size, overlap in settings:
+            chunks = load_chunks(args.data_dir, chunk_size, overlap)
+            embeddings.embed_documents([c.page_content for c in chunks])
+
+        for chunk_size, overlap in settings:
+            start = time.perf_counter()
+            chunks = load_chunks(args.data_dir, chunk_size, overlap)
+            store = LocalVectorStore.from_documents(chunks, embeddings)
+            build_s = time.perf_counter() - start
+
+            # Cold cost: warm build plus embedding every chunk from scratch
+            cold_build_s = (
+                build_s + len(chunks) * embeddings.seconds_per_text
+                if embeddings.seconds_per_text else None
+            )
+            logger.info(f"chunk_size={chunk_size} overlap={overlap}: {len(chunks)} chunks")
+
+            for k, mode in itertools.product(ints(args.ks), args.modes.split(",")):
+                results.append({
+                    "chunk_size": chunk_size,
+                    "chunk_overlap": overlap,
+                    "k": k,
+                    "mode": mode,
+                    "chunks": len(chunks),
+                    "build_s": build_s,
+                    "cold_build_s": cold_build_s,
+                    **evaluate(store, eval_set, mode, k),
+                })
+    finally:
+        embeddings.save()
+
+    logger.info(f"Embedding cache: {embeddings.hits} hits, {embeddings.misses} misses")
+    return results
+
+
+def pick_fastest(results: list, min_recall: float):
+    """Cheapest setting meeting the bar. Prompt tokens drive answer latency;
+    local query time is sub-millisecond noise and only breaks ties."""
+    passing = [r for r in results if r["recall_at_k"] >= min_recall]
+    if not passing:
+        return None
+    return min(passing, key=lambda r: (r["prompt_tokens"], r["query_ms"]))
+
+
+def print_report(results: list, best):
+    print(
+        f"{'size':>5} {'ovlp':>5} {'k':>3} {'mode':>10} {'chunks':>6} "
+        f"{'recall':>7} {'mrr':>6} {'warm s':>7} {'cold s':>7} {'query ms':>9} {'tokens':>7}"
+    )
+    for r in sorted(results, key=lambda r: (-r["recall_at_k"], r["prompt_tokens"])):
+        marker = "  <- fastest meeting bar" if r is best else ""
+        cold = f"{r['cold_build_s']:.2f}" if r["cold_build_s"] is not None else "n/a"
+        print(
+            f"{r['chunk_size']:>5} {r['chunk_overlap']:>5} {r['k']:>3} {r['mode']:>10} {r['chunks']:>6} "
+            f"{r['recall_at_k']:>7.2f} {r['mrr']:>6.2f} {r['build_s']:>7.2f} {cold:>7} "
+            f"{r['query_ms']:>9.1f} {r['prompt_tokens']:>7.0f}{marker}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sweep retrieval parameters: recall vs latency")
+    parser.add_argument("--eval-set", default=str(Path(Config.DATA_DIR) / "eval_set.json"))
+    parser.add_argument("--data-dir", default=Config.DATA_DIR)
+    parser.add_argument("--chunk-sizes", default="250,500,1000")
+    parser.add_argument("--overlaps", default="0,50,100")
+    parser.add_argument("--ks", default="1,3,5")
+    parser.add_argument("--modes", default=",".join(MODES))
+    parser.add_argument("--embeddings", default="sentence-transformers/all-MiniLM-L6-v2",
+                        help='HuggingFace model name, or "hashing" for a model-free run')
+    parser.add_argument("--cache-dir", default=".cache/embeddings")
+    parser.add_argument("--min-recall", type=float, default=0.8)
+    parser.add_argument("--json", help="Write results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+    logger.setLevel(logging.INFO)
+
+    results = sweep(args)
+    best = pick_fastest(results, args.min_recall)
+    print_report(results, best)
+
+    if best:
+        print(
+            f"\nFastest with recall@k >= {args.min_recall}: chunk_size={best['chunk_size']} "
+            f"chunk_overlap={best['chunk_overlap']} k={best['k']} mode={best['mode']}"
+        )
+    else:
+        print(f"\nNo setting reaches recall@k >= {args.min_recall}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "best": best}, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
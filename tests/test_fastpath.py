@@ -0,0 +1,72 @@
+from langchain_core.documents import Document
+
+from src.fastpath import FastPath
+
+# Chunk as produced by load_chunks() at the default chunk size: the tail of
+# "2. Where MMTT Is Used / Present" running into "3. Why MMTT Was Built"
+WHERE_USED_CHUNK = """- Defense and security operations
+- Surveillance and monitoring systems
+- Tactical training simulations
+- Command and control centers
+- Research and analytics platforms
+- Smart monitoring systems (movement, events, assets)
+
+It can be deployed as a web-based platform, integrated into internal systems, or used as a decision-support tool.
+
+
+3. Why MMTT Was Built
+--------------------
+MMTT was built to solve the following problems:"""
+
+MENTOR_CHUNK = """---------------------------------
+TEAM MENTOR
+---------------------------------
+
+Name: Abhishek Kumar
+Role: Team Mentor
+Description:
+Abhishek Kumar mentors the team by providing technical guidance,
+system-level insights, and strategic direction. He ensures the
+project aligns with SIH objectives and real-world feasibility.
+
+GitHub: https://github.com/Abhi2790
+LinkedIn: https://www.linkedin.com/in/abhishek-461295338
+Instagram: https://www.instagram.com/abhi_shek_2790"""
+
+
+def answer(query, text):
+    res = FastPath(enabled=True).try_answer(query, [(Document(page_content=text), 0.9)])
+    return res and res["response"]
+
+
+def test_where_lookup_without_a_place_or_list_goes_to_llm():
+    assert answer("Where is MMTT used?", WHERE_USED_CHUNK) is None
+
+
+def test_where_lookup_answers_with_intro_and_list():
+    text = (
+        "MMTT is intended for use in environments that require continuous "
+        "monitoring and tactical awareness, including:\n\n"
+        "- Defense and security operations\n"
+        "- Surveillance and monitoring systems"
+    )
+    assert answer("Where is MMTT used?", text).endswith("- Surveillance and monitoring systems")
+
+
+def test_wrapped_prose_is_answered_as_a_full_sentence():
+    assert answer("Who is Abhishek Kumar?", MENTOR_CHUNK) == (
+        "Abhishek Kumar mentors the team by providing technical guidance, "
+        "system-level insights, and strategic direction."
+    )
+
+
+def test_link_lookup_scores_the_entity_not_the_word_link():
+    assert answer("What is the GitHub link of Abhishek Kumar?", MENTOR_CHUNK) == (
+        "GitHub: https://github.com/Abhi2790"
+    )
+    assert answer("What is the GitHub link of Rohit Sharma?", MENTOR_CHUNK) is None
+
+
+def test_website_lookup_skips_social_links():
+    text = "LINKS\n-----\nhttps://www.instagram.com/team\nhttps://www.playmetrics.site/"
+    assert answer("What is the website URL?", text) == "https://www.playmetrics.site/"